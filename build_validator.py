@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Build script: AOT-compile the filename validator into a C extension.
+
+Run `python build_validator.py` in an environment with `numba<0.61`
+installed (numba.pycc was deprecated in 0.57 and removed in 0.61); it
+produces a validator_c extension module next to this script. The
+compiled code carries no Numba runtime dependency and no JIT warmup, so
+the extension can ship to machines that only have numpy. validate_files
+picks it up automatically when present and falls back to pure Python
+otherwise.
+"""
+
+import numpy as np
+from numba.pycc import CC
+
+from validate_files import _LANG_MAP, _SPEECH_MAP, _BG_MAP
+
+# Same encoding as the njit batch kernel: class index per (position,
+# ASCII byte), baked into the extension as a compile-time constant
+_CODE_CLASS = np.full((3, 256), -1, dtype=np.int8)
+for _pos, _map in enumerate((_LANG_MAP, _SPEECH_MAP, _BG_MAP)):
+    for _idx, _ch in enumerate(_map):
+        _CODE_CLASS[_pos, ord(_ch)] = _idx
+
+cc = CC('validator_c')
+cc.target_cpu = 'host'
+
+
+@cc.export('validate', 'i1(u1, u1, u1)')
+def validate(a, b, c):
+    """Classify one 3-byte stem; -1 marks invalid, valid stems encode
+    lang*9 + speech*3 + background"""
+    x = _CODE_CLASS[0, a]
+    y = _CODE_CLASS[1, b]
+    z = _CODE_CLASS[2, c]
+    if x < 0 or y < 0 or z < 0:
+        return -1
+    return x * 9 + y * 3 + z
+
+
+if __name__ == '__main__':
+    cc.compile()
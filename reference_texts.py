@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Shared reference texts for the ENC test scripts
+Single source of truth so the demo, simple and full test paths always
+compare transcriptions against identical phrases
+"""
+
+import functools
+import string
+from pathlib import Path
+
+# Translation table covering ASCII plus common typographic/CJK punctuation;
+# mapping to None deletes, matching jiwer.RemovePunctuation ("hasn't" must
+# stay one token, not split into two)
+_PUNCT_TABLE = str.maketrans({c: None for c in string.punctuation + "—–…“”‘’«»、。，！？；：「」『』"})
+
+def normalize(text: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace in a single pass.
+
+    Equivalent to the jiwer pipeline (ToLowerCase, RemoveMultipleSpaces,
+    Strip, RemovePunctuation) but fused into one str.translate pass with
+    no intermediate string allocations.
+    """
+    return " ".join(text.translate(_PUNCT_TABLE).lower().split())
+
+# Reference phrases per language; EN_ACCENT recordings reuse the EN phrase
+REFERENCES = {
+    'EN': "Hey, just thinking out loud here. I had an idea during my walk—what if we made the intro flow more dynamic? Maybe animations or voice cues? Could be good for first-time users. Also, Marcus still hasn't sent the revised mockups. Need to chase that. Oh, and budget—Jill flagged an inconsistency. Gotta double-check the numbers. Anyway, I'm recording this now so I don't forget later. Testing, testing—how's the clarity? Hopefully background noise is cleaner with the new update. Alright, that's it for now. Saving this and moving on. Add this recording to the work collection.",
+    'CN': "刚刚路上突然想到一个点子，录一下以防忘了。那个新手引导是不是可以做得更有互动感一点？比如加点动画或者语音提示，可能对第一次用的用户更友好。然后，马克那边的新版图还没发我，得催一下。还有预算那块，吉尔说有个地方对不上，我回头再核对一下。顺便测试下这个录音效果，新功能应该能降点噪吧？听得清吗？把这份录音添加到工作收藏夹里面。",
+    'SV': "Fick en idé på vägen hem, tänkte spela in innan jag glömmer. Kanske borde vi göra introduktionen lite mer interaktiv? Typ lägga till animationer eller röststöd—kan hjälpa nya användare att fatta snabbare. Förresten, Marcus har fortfarande inte skickat de uppdaterade mockupsen, måste påminna honom. Och budgeten—Jill nämnde att nåt inte stämmer där, jag kollar det sen. Testar ljudet nu också—hörs det klart? Bakgrundsljudet borde vara mindre med nya funktionen. Okej, det var allt för nu. Lägg till det här i arbetskollektionen."
+}
+
+# Heavy-accent English recordings are scored against the same EN phrase
+REFERENCES['EN_ACCENT'] = REFERENCES['EN']
+
+# Normalized once at import and shared by every evaluator instance
+NORMALIZED = {language: normalize(text) for language, text in REFERENCES.items()}
+
+# Filename language codes (first character of the 3-char test code)
+LANGUAGE_CODES = {'A': 'EN', 'B': 'EN_ACCENT', 'C': 'CN', 'D': 'SV'}
+
+@functools.lru_cache(maxsize=256)
+def detect_language(filename: str) -> str:
+    """Map a filename's leading code character to its language key"""
+    name = Path(filename).stem.upper()
+    if name:
+        return LANGUAGE_CODES.get(name[0], 'EN')
+    return 'EN'  # Default to English
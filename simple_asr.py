@@ -9,18 +9,16 @@ import argparse
 from pathlib import Path
 import logging
 
+from reference_texts import REFERENCES, detect_language
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class SimpleASR:
     def __init__(self):
-        # Reference texts for different languages
-        self.reference_texts = {
-            'EN': "Hey, just thinking out loud here. I had an idea during my walk—what if we made the intro flow more dynamic? Maybe animations or voice cues? Could be good for first-time users. Also, Marcus still hasn't sent the revised mockups. Need to chase that. Oh, and budget—Jill flagged an inconsistency. Gotta double-check the numbers. Anyway, I'm recording this now so I don't forget later. Testing, testing—how's the clarity? Hopefully background noise is cleaner with the new update. Alright, that's it for now. Saving this and moving on. Add this recording to the work collection.",
-            'CN': "刚刚路上突然想到一个点子，录一下以防忘了。那个新手引导是不是可以做得更有互动感一点？比如加点动画或者语音提示，可能对第一次用的用户更友好。然后，马克那边的新版图还没发我，得催一下。还有预算那块，吉尔说有个地方对不上，我回头再核对一下。顺便测试下这个录音效果，新功能应该能降点噪吧？听得清吗？把这份录音添加到工作收藏夹里面。",
-            'SV': "Fick en idé på vägen hem, tänkte spela in innan jag glömmer. Kanske borde vi göra introduktionen lite mer interaktiv? Typ lägga till animationer eller röststöd—kan hjälpa nya användare att fatta snabbare. Förresten, Marcus har fortfarande inte skickat de uppdaterade mockupsen, måste påminna honom. Och budgeten—Jill nämnde att nåt inte stämmer där, jag kollar det sen. Testar ljudet nu också—hörs det klart? Bakgrundsljudet borde vara mindre med nya funktionen. Okej, det var allt för nu. Lägg till det här i arbetskollektionen."
-        }
+        # Reference texts for different languages, shared with the other scripts
+        self.reference_texts = REFERENCES
     
     def check_dependencies(self) -> bool:
         """Check if required dependencies are installed"""
@@ -49,6 +47,12 @@ class SimpleASR:
     
     def compute_wer(self, reference: str, hypothesis: str) -> float:
         """Compute Word Error Rate"""
+        # Cheap edge cases first: empty strings and identical strings need
+        # no normalization or edit distance
+        if not reference or not hypothesis:
+            return 1.0
+        if reference == hypothesis:
+            return 0.0
         try:
             import jiwer
             transformation = jiwer.Compose([
@@ -71,6 +75,10 @@ class SimpleASR:
     
     def compute_cer(self, reference: str, hypothesis: str) -> float:
         """Compute Character Error Rate"""
+        if not reference or not hypothesis:
+            return 1.0
+        if reference == hypothesis:
+            return 0.0
         try:
             import jiwer
             transformation = jiwer.Compose([
@@ -92,13 +100,8 @@ class SimpleASR:
             return 1.0
     
     def detect_language_from_filename(self, filename: str) -> str:
-        """Detect language from filename (first character)"""
-        name = Path(filename).stem.upper()
-        if len(name) >= 1:
-            language_code = name[0]
-            language_map = {'A': 'EN', 'B': 'EN', 'C': 'CN', 'D': 'SV'}
-            return language_map.get(language_code, 'EN')
-        return 'EN'  # Default to English
+        """Detect language from filename (first character), cached per stem"""
+        return detect_language(filename)
     
     def process_audio_file(self, audio_path: str, reference_text: str = None) -> dict:
         """Process a single audio file and return results"""
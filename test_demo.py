@@ -6,6 +6,7 @@ This creates sample data and runs a demonstration
 
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from test_script import ENCTestEvaluator
 
@@ -34,10 +35,12 @@ def create_sample_data():
         "DCC.wav",  # SV WHISPER SPEAKING
     ]
     
-    for filename in sample_files:
-        # Create empty files for demo
-        (skywalk_dir / filename).touch()
-        (nothing_dir / filename).touch()
+    # Create empty files for demo; touches run in parallel since each is
+    # just a round-trip to the filesystem
+    sample_paths = ([skywalk_dir / f for f in sample_files] +
+                    [nothing_dir / f for f in sample_files])
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda p: p.touch(), sample_paths))
     
     print(f"Created {len(sample_files)} sample files in each directory")
     print("Note: These are empty files for demonstration purposes")
@@ -7,31 +7,37 @@ Uses Whisper V3 Turbo Large as the universal ASR model for consistent,
 high-quality transcription across all test conditions.
 """
 
+import io
 import os
 import json
 import subprocess
-import pandas as pd
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import logging
 from datetime import datetime
 
+from reference_texts import REFERENCES, NORMALIZED, normalize as _normalize
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Test-condition code tables, indexed by ord(code) - ord('A')
+_LANGUAGES = ('EN', 'EN_ACCENT', 'CN', 'SV')
+_SPEECH_TYPES = ('REGULAR', 'QUIET', 'WHISPER')
+_BACKGROUNDS = ('NIGHTCLUB', 'CAFE', 'SPEAKING')
+
 class ENCTestEvaluator:
     def __init__(self, data_dir: str = "data"):
         self.data_dir = Path(data_dir)
         self.skywalk_dir = self.data_dir / "skywalk"
         self.nothing_dir = self.data_dir / "nothing"
         
-        # Test phrases in different languages
-        self.test_phrases = {
-            'EN': "Hey, just thinking out loud here. I had an idea during my walk—what if we made the intro flow more dynamic? Maybe animations or voice cues? Could be good for first-time users. Also, Marcus still hasn't sent the revised mockups. Need to chase that. Oh, and budget—Jill flagged an inconsistency. Gotta double-check the numbers. Anyway, I'm recording this now so I don't forget later. Testing, testing—how's the clarity? Hopefully background noise is cleaner with the new update. Alright, that's it for now. Saving this and moving on. Add this recording to the work collection.",
-            'CN': "刚刚路上突然想到一个点子，录一下以防忘了。那个新手引导是不是可以做得更有互动感一点？比如加点动画或者语音提示，可能对第一次用的用户更友好。然后，马克那边的新版图还没发我，得催一下。还有预算那块，吉尔说有个地方对不上，我回头再核对一下。顺便测试下这个录音效果，新功能应该能降点噪吧？听得清吗？把这份录音添加到工作收藏夹里面。",
-            'SV': "Fick en idé på vägen hem, tänkte spela in innan jag glömmer. Kanske borde vi göra introduktionen lite mer interaktiv? Typ lägga till animationer eller röststöd—kan hjälpa nya användare att fatta snabbare. Förresten, Marcus har fortfarande inte skickat de uppdaterade mockupsen, måste påminna honom. Och budgeten—Jill nämnde att nåt inte stämmer där, jag kollar det sen. Testar ljudet nu också—hörs det klart? Bakgrundsljudet borde vara mindre med nya funktionen. Okej, det var allt för nu. Lägg till det här i arbetskollektionen."
-        }
+        # Test phrases in different languages, shared with the other scripts
+        self.test_phrases = REFERENCES
         
         # Test conditions mapping
         self.languages = ['EN', 'EN_ACCENT', 'CN', 'SV']
@@ -42,20 +48,50 @@ class ENCTestEvaluator:
             'skywalk': {},
             'nothing': {}
         }
-    
+
+        # Precomputed code -> conditions table covering all 36 valid codes
+        self._parse_table = {
+            a + b + c: {'language': lang, 'speech_type': speech, 'background': bg}
+            for a, lang in zip('ABCD', _LANGUAGES)
+            for b, speech in zip('ABC', _SPEECH_TYPES)
+            for c, bg in zip('ABC', _BACKGROUNDS)
+        }
+
+        # Lazily-initialized heavy resources, shared across all files in a run
+        self._whisper_model = None
+        self._model_lock = threading.Lock()
+
+    def _model(self):
+        """Load the quantized Whisper model once and reuse it for every transcription"""
+        with self._model_lock:
+            if self._whisper_model is None:
+                import ctranslate2
+                from faster_whisper import WhisperModel
+                if ctranslate2.get_cuda_device_count() > 0:
+                    device, compute_type = "cuda", "int8_float16"
+                else:
+                    device, compute_type = "cpu", "int8"
+                logger.info(f"Loading Whisper large-v3 model ({compute_type}) on {device}...")
+                self._whisper_model = WhisperModel("large-v3", device=device, compute_type=compute_type)
+        return self._whisper_model
+
+    def _reference_clean(self, language: str) -> str:
+        """Return the normalized reference text for a language, computed once at import"""
+        return NORMALIZED.get(language, "")
+
     def check_dependencies(self) -> bool:
         """Check if required dependencies are installed"""
-        try:
-            # Check for speech recognition libraries
-            import speech_recognition
-            import jiwer
-            import whisper
-            logger.info("All required dependencies are available")
-            return True
-        except ImportError as e:
-            logger.error(f"Missing dependency: {e}")
-            logger.info("Please install required packages: pip install SpeechRecognition jiwer openai-whisper")
+        import importlib.util
+        # find_spec only reads package metadata, so the multi-second
+        # faster-whisper import stays deferred until first transcription
+        missing = [module for module in ('rapidfuzz', 'faster_whisper')
+                   if importlib.util.find_spec(module) is None]
+        if missing:
+            logger.error(f"Missing dependencies: {', '.join(missing)}")
+            logger.info("Please install required packages: pip install rapidfuzz faster-whisper")
             return False
+        logger.info("All required dependencies are available")
+        return True
     
     def get_audio_files(self, system: str) -> List[Path]:
         """Get all audio files from the specified system directory"""
@@ -64,10 +100,13 @@ class ENCTestEvaluator:
             logger.warning(f"Directory {system_dir} does not exist")
             return []
         
-        audio_files = []
-        for ext in ['*.wav', '*.mp3', '*.m4a', '*.flac']:
-            audio_files.extend(system_dir.glob(ext))
-        
+        # One scandir pass instead of one glob traversal per extension
+        exts = {'wav', 'mp3', 'm4a', 'flac'}
+        with os.scandir(system_dir) as entries:
+            audio_files = [Path(entry.path) for entry in entries
+                           if entry.is_file() and '.' in entry.name
+                           and entry.name.rsplit('.', 1)[-1].lower() in exts]
+
         logger.info(f"Found {len(audio_files)} audio files in {system}")
         return audio_files
     
@@ -76,82 +115,130 @@ class ENCTestEvaluator:
         # Remove extension
         name = Path(filename).stem.upper()
         
+        # Valid codes resolve with a single table lookup
+        conditions = self._parse_table.get(name)
+        if conditions is not None:
+            return {**conditions, 'filename': filename}
+
         if len(name) != 3:
             logger.warning(f"Invalid filename format: {filename}")
             return {}
-        
-        # Parse the three-character code
-        language_code = name[0]
-        speech_code = name[1]
-        background_code = name[2]
-        
-        # Map codes to conditions
-        language_map = {'A': 'EN', 'B': 'EN_ACCENT', 'C': 'CN', 'D': 'SV'}
-        speech_map = {'A': 'REGULAR', 'B': 'QUIET', 'C': 'WHISPER'}
-        background_map = {'A': 'NIGHTCLUB', 'B': 'CAFE', 'C': 'SPEAKING'}
-        
+
+        # Slow path for out-of-schema codes of the right length
+        a, b, c = (ord(ch) - 65 for ch in name)
+
         return {
-            'language': language_map.get(language_code, 'UNKNOWN'),
-            'speech_type': speech_map.get(speech_code, 'UNKNOWN'),
-            'background': background_map.get(background_code, 'UNKNOWN'),
+            'language': _LANGUAGES[a] if 0 <= a < len(_LANGUAGES) else 'UNKNOWN',
+            'speech_type': _SPEECH_TYPES[b] if 0 <= b < len(_SPEECH_TYPES) else 'UNKNOWN',
+            'background': _BACKGROUNDS[c] if 0 <= c < len(_BACKGROUNDS) else 'UNKNOWN',
             'filename': filename
         }
     
     def transcribe_audio(self, audio_path: Path) -> str:
         """Transcribe audio file using Whisper V3 Turbo Large"""
+        return self._transcribe_batch([audio_path])[0]
+
+    def _transcribe_batch(self, audio_paths: List[Path], batch_size: int = 8) -> List[str]:
+        """Transcribe audio files, overlapping audio decode with inference.
+
+        A small thread pool prefetches decoded 16 kHz audio (at most
+        batch_size files in flight) while the main thread feeds the
+        faster-whisper (CTranslate2, INT8) model, hiding disk I/O and
+        resampling behind transcription. Returns transcriptions aligned
+        with the input list; failed files yield an empty string.
+        """
+        # Nothing to do means no model load: evaluating an empty or
+        # missing directory must stay as cheap as it was before batching
+        if not audio_paths:
+            return []
+
         try:
-            import whisper
-            # Use Whisper V3 Turbo Large for consistent high-quality transcription
-            model = whisper.load_model("large-v3")
-            result = model.transcribe(str(audio_path))
-            return result["text"].strip()
+            from faster_whisper.audio import decode_audio
+            model = self._model()
         except Exception as e:
-            logger.error(f"Error transcribing {audio_path}: {e}")
-            return ""
-    
-    def compute_wer(self, reference: str, hypothesis: str) -> float:
-        """Compute Word Error Rate"""
+            logger.error(f"Error loading Whisper model: {e}")
+            return [""] * len(audio_paths)
+
         try:
-            import jiwer
-            transformation = jiwer.Compose([
-                jiwer.ToLowerCase(),
-                jiwer.RemoveMultipleSpaces(),
-                jiwer.Strip(),
-                jiwer.RemovePunctuation()
-            ])
-            
-            reference_clean = transformation(reference)
-            hypothesis_clean = transformation(hypothesis)
-            
-            if not reference_clean:
-                return 1.0
-            
-            return jiwer.wer(reference_clean, hypothesis_clean)
-        except Exception as e:
-            logger.error(f"Error computing WER: {e}")
-            return 1.0
+            import torchaudio
+        except ImportError:
+            torchaudio = None
+
+        def load_audio(audio_path: Path):
+            """Decode to 16 kHz mono float32 in-process, no ffmpeg subprocess"""
+            try:
+                if torchaudio is not None:
+                    waveform, sample_rate = torchaudio.load(str(audio_path))
+                    if sample_rate != 16000:
+                        waveform = torchaudio.functional.resample(waveform, sample_rate, 16000)
+                    return waveform.mean(dim=0).numpy()
+                return decode_audio(str(audio_path), sampling_rate=16000)
+            except Exception as e:
+                logger.error(f"Error loading {audio_path}: {e}")
+                return None
+
+        def transcribe(audio_path: Path, audio) -> str:
+            if audio is None:
+                return ""
+            try:
+                # Silero VAD drops non-speech frames before the encoder, which
+                # matters for the sparse QUIET/WHISPER recordings
+                segments, _ = model.transcribe(
+                    audio, beam_size=5,
+                    vad_filter=True,
+                    vad_parameters=dict(min_silence_duration_ms=500))
+                text = " ".join(segment.text.strip() for segment in segments)
+                return text.strip()
+            except Exception as e:
+                logger.error(f"Error transcribing {audio_path}: {e}")
+                return ""
+
+        transcriptions = []
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            pending = deque()
+            for audio_path in audio_paths:
+                pending.append((audio_path, executor.submit(load_audio, audio_path)))
+                if len(pending) >= batch_size:
+                    path, future = pending.popleft()
+                    transcriptions.append(transcribe(path, future.result()))
+            while pending:
+                path, future = pending.popleft()
+                transcriptions.append(transcribe(path, future.result()))
+        return transcriptions
     
-    def compute_cer(self, reference: str, hypothesis: str) -> float:
-        """Compute Character Error Rate"""
+    def compute_metrics(self, reference: str, hypothesis: str,
+                        reference_clean: Optional[str] = None) -> Tuple[float, float]:
+        """Compute (WER, CER) together; accepts a pre-normalized reference
+
+        Both metrics derive from edit distance over the same normalized
+        strings, so normalizing once here halves the work of computing
+        them separately.
+        """
+        # Cheap edge cases first: failed transcriptions come through as ""
+        # and identical strings need no normalization or edit distance
+        if not reference or not hypothesis:
+            return 1.0, 1.0
+        if reference == hypothesis:
+            return 0.0, 0.0
+
         try:
-            import jiwer
-            transformation = jiwer.Compose([
-                jiwer.ToLowerCase(),
-                jiwer.RemoveMultipleSpaces(),
-                jiwer.Strip(),
-                jiwer.RemovePunctuation()
-            ])
-            
-            reference_clean = transformation(reference)
-            hypothesis_clean = transformation(hypothesis)
-            
+            from rapidfuzz.distance import Levenshtein
+
+            if reference_clean is None:
+                reference_clean = _normalize(reference)
+            hypothesis_clean = _normalize(hypothesis)
+
             if not reference_clean:
-                return 1.0
-            
-            return jiwer.cer(reference_clean, hypothesis_clean)
+                return 1.0, 1.0
+
+            ref_words = reference_clean.split()
+            hyp_words = hypothesis_clean.split()
+            wer = Levenshtein.distance(ref_words, hyp_words) / max(len(ref_words), 1)
+            cer = Levenshtein.distance(reference_clean, hypothesis_clean) / max(len(reference_clean), 1)
+            return wer, cer
         except Exception as e:
-            logger.error(f"Error computing CER: {e}")
-            return 1.0
+            logger.error(f"Error computing metrics: {e}")
+            return 1.0, 1.0
     
     def evaluate_system(self, system: str) -> Dict:
         """Evaluate all audio files for a given system"""
@@ -159,34 +246,40 @@ class ENCTestEvaluator:
         
         audio_files = self.get_audio_files(system)
         system_results = {}
-        
+
+        # Collect all valid samples first so transcription can be batched
+        samples = []
         for audio_file in audio_files:
-            logger.info(f"Processing: {audio_file.name}")
-            
             # Parse filename to get test conditions
             conditions = self.parse_filename(audio_file.name)
             if not conditions:
                 continue
-            
+
             # Get reference text based on language
             language = conditions['language']
             if language == 'EN_ACCENT':
                 language = 'EN'  # Use same reference text for accent
-            
+
             reference_text = self.test_phrases.get(language, "")
             if not reference_text:
                 logger.warning(f"No reference text for language: {language}")
                 continue
-            
-            # Transcribe audio
-            transcription = self.transcribe_audio(audio_file)
+
+            samples.append((audio_file, conditions, language, reference_text))
+
+        # Transcribe all files in one batched pass over the shared model
+        transcriptions = self._transcribe_batch([s[0] for s in samples])
+
+        for (audio_file, conditions, language, reference_text), transcription in zip(samples, transcriptions):
+            logger.info(f"Processing: {audio_file.name}")
+
             if not transcription:
                 logger.warning(f"Failed to transcribe: {audio_file.name}")
                 continue
-            
-            # Compute metrics
-            wer = self.compute_wer(reference_text, transcription)
-            cer = self.compute_cer(reference_text, transcription)
+
+            # Compute metrics against the cached normalized reference
+            wer, cer = self.compute_metrics(reference_text, transcription,
+                                            self._reference_clean(language))
             
             # Store results
             test_key = f"{conditions['language']}_{conditions['speech_type']}_{conditions['background']}"
@@ -203,31 +296,54 @@ class ENCTestEvaluator:
         
         return system_results
     
-    def generate_report(self) -> str:
-        """Generate comprehensive comparison report"""
-        report_lines = []
-        report_lines.append("=" * 80)
-        report_lines.append("SKYWALK vs NOTHING ENC PERFORMANCE COMPARISON")
-        report_lines.append("=" * 80)
-        report_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report_lines.append("")
+    def generate_report(self, out_file=None) -> str:
+        """Generate comprehensive comparison report.
+
+        Lines are streamed straight to out_file when one is given;
+        otherwise they are buffered in a StringIO and returned, avoiding
+        the intermediate list of strings either way.
+        """
+        buffer = None
+        if out_file is None:
+            buffer = io.StringIO()
+            out_file = buffer
+        write = out_file.write
+
+        write("=" * 80 + "\n")
+        write("SKYWALK vs NOTHING ENC PERFORMANCE COMPARISON\n")
+        write("=" * 80 + "\n")
+        write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        write("\n")
         
+        # One pass per system collects both overall and per-language sums
+        totals = {}
+        lang_stats = {}
+        for system, system_results in self.results.items():
+            sum_wer = sum_cer = 0.0
+            per_lang = defaultdict(lambda: {'wer': 0.0, 'cer': 0.0, 'n': 0})
+            for r in system_results.values():
+                sum_wer += r['wer']
+                sum_cer += r['cer']
+                stats = per_lang[r['conditions']['language']]
+                stats['wer'] += r['wer']
+                stats['cer'] += r['cer']
+                stats['n'] += 1
+            totals[system] = (len(system_results), sum_wer, sum_cer)
+            lang_stats[system] = per_lang
+
         # Summary statistics
         for system in ['skywalk', 'nothing']:
-            if system in self.results and self.results[system]:
-                total_files = len(self.results[system])
-                avg_wer = sum(r['wer'] for r in self.results[system].values()) / total_files
-                avg_cer = sum(r['cer'] for r in self.results[system].values()) / total_files
-                
-                report_lines.append(f"{system.upper()} SYSTEM:")
-                report_lines.append(f"  Total files processed: {total_files}")
-                report_lines.append(f"  Average WER: {avg_wer:.4f}")
-                report_lines.append(f"  Average CER: {avg_cer:.4f}")
-                report_lines.append("")
-        
+            total_files, sum_wer, sum_cer = totals.get(system, (0, 0.0, 0.0))
+            if total_files:
+                write(f"{system.upper()} SYSTEM:\n")
+                write(f"  Total files processed: {total_files}\n")
+                write(f"  Average WER: {sum_wer / total_files:.4f}\n")
+                write(f"  Average CER: {sum_cer / total_files:.4f}\n")
+                write("\n")
+
         # Detailed comparison by test condition
-        report_lines.append("DETAILED COMPARISON BY TEST CONDITION:")
-        report_lines.append("-" * 60)
+        write("DETAILED COMPARISON BY TEST CONDITION:\n")
+        write("-" * 60 + "\n")
         
         # Get all unique test conditions
         all_conditions = set()
@@ -235,63 +351,51 @@ class ENCTestEvaluator:
             all_conditions.update(system_results.keys())
         
         for condition in sorted(all_conditions):
-            report_lines.append(f"\nTest Condition: {condition}")
-            
+            write(f"\nTest Condition: {condition}\n")
+
             skywalk_result = self.results.get('skywalk', {}).get(condition)
             nothing_result = self.results.get('nothing', {}).get(condition)
-            
+
             if skywalk_result:
-                report_lines.append(f"  Skywalk - WER: {skywalk_result['wer']:.4f}, CER: {skywalk_result['cer']:.4f}")
+                write(f"  Skywalk - WER: {skywalk_result['wer']:.4f}, CER: {skywalk_result['cer']:.4f}\n")
             else:
-                report_lines.append("  Skywalk - No data")
-            
+                write("  Skywalk - No data\n")
+
             if nothing_result:
-                report_lines.append(f"  Nothing - WER: {nothing_result['wer']:.4f}, CER: {nothing_result['cer']:.4f}")
+                write(f"  Nothing - WER: {nothing_result['wer']:.4f}, CER: {nothing_result['cer']:.4f}\n")
             else:
-                report_lines.append("  Nothing - No data")
-            
+                write("  Nothing - No data\n")
+
             # Calculate improvement
             if skywalk_result and nothing_result:
                 wer_improvement = nothing_result['wer'] - skywalk_result['wer']
                 cer_improvement = nothing_result['cer'] - skywalk_result['cer']
-                
-                report_lines.append(f"  Improvement - WER: {wer_improvement:+.4f}, CER: {cer_improvement:+.4f}")
-        
+
+                write(f"  Improvement - WER: {wer_improvement:+.4f}, CER: {cer_improvement:+.4f}\n")
+
         # Performance by language
-        report_lines.append("\n" + "=" * 60)
-        report_lines.append("PERFORMANCE BY LANGUAGE:")
-        report_lines.append("-" * 60)
-        
-        for language in ['EN', 'EN_ACCENT', 'CN', 'SV']:
-            skywalk_lang_results = [r for r in self.results.get('skywalk', {}).values() 
-                                  if r['conditions']['language'] == language]
-            nothing_lang_results = [r for r in self.results.get('nothing', {}).values() 
-                                  if r['conditions']['language'] == language]
-            
-            if skywalk_lang_results:
-                skywalk_avg_wer = sum(r['wer'] for r in skywalk_lang_results) / len(skywalk_lang_results)
-                skywalk_avg_cer = sum(r['cer'] for r in skywalk_lang_results) / len(skywalk_lang_results)
-            else:
-                skywalk_avg_wer = skywalk_avg_cer = None
-            
-            if nothing_lang_results:
-                nothing_avg_wer = sum(r['wer'] for r in nothing_lang_results) / len(nothing_lang_results)
-                nothing_avg_cer = sum(r['cer'] for r in nothing_lang_results) / len(nothing_lang_results)
-            else:
-                nothing_avg_wer = nothing_avg_cer = None
-            
-            report_lines.append(f"\n{language}:")
-            if skywalk_avg_wer is not None:
-                report_lines.append(f"  Skywalk - Avg WER: {skywalk_avg_wer:.4f}, Avg CER: {skywalk_avg_cer:.4f}")
-            if nothing_avg_wer is not None:
-                report_lines.append(f"  Nothing - Avg WER: {nothing_avg_wer:.4f}, Avg CER: {nothing_avg_cer:.4f}")
-        
-        return "\n".join(report_lines)
+        write("\n" + "=" * 60 + "\n")
+        write("PERFORMANCE BY LANGUAGE:\n")
+        write("-" * 60 + "\n")
+
+        for language in _LANGUAGES:
+            write(f"\n{language}:\n")
+            for system in ['skywalk', 'nothing']:
+                stats = lang_stats.get(system, {}).get(language)
+                if stats:
+                    write(f"  {system.capitalize()} - Avg WER: {stats['wer'] / stats['n']:.4f}, "
+                          f"Avg CER: {stats['cer'] / stats['n']:.4f}\n")
+
+        return buffer.getvalue() if buffer is not None else ""
     
     def save_results(self, output_file: str = "enc_test_results.json"):
         """Save detailed results to JSON file"""
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2, ensure_ascii=False)
+        try:
+            import orjson
+            Path(output_file).write_bytes(orjson.dumps(self.results, option=orjson.OPT_INDENT_2))
+        except ImportError:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(self.results, f, indent=2, ensure_ascii=False)
         logger.info(f"Results saved to {output_file}")
     
     def run_evaluation(self) -> Dict:
@@ -301,15 +405,16 @@ class ENCTestEvaluator:
         if not self.check_dependencies():
             return {}
         
-        # Evaluate both systems
-        for system in ['skywalk', 'nothing']:
-            logger.info(f"Evaluating {system} system...")
-            self.results[system] = self.evaluate_system(system)
+        # Evaluate both systems concurrently so audio I/O for one overlaps
+        # with inference for the other (the model is shared and thread-safe)
+        systems = ['skywalk', 'nothing']
+        with ThreadPoolExecutor(max_workers=len(systems)) as executor:
+            for system, system_results in zip(systems, executor.map(self.evaluate_system, systems)):
+                self.results[system] = system_results
         
-        # Generate and save report
-        report = self.generate_report()
+        # Generate the report, streaming lines straight into the file
         with open("enc_test_report.txt", 'w', encoding='utf-8') as f:
-            f.write(report)
+            self.generate_report(f)
         
         # Save detailed results
         self.save_results()
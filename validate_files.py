@@ -3,92 +3,284 @@
 Validation script to check audio file naming convention
 """
 
+import functools
 import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, NamedTuple
 
-def validate_filename(filename: str) -> Dict:
+class ValidationResult(NamedTuple):
+    """Immutable validation outcome; fixed field offsets, no per-call dict"""
+    valid: bool
+    language: str = ''
+    speech_type: str = ''
+    background: str = ''
+    error: str = ''
+
+# Naming-convention schema; every derived table below is built from
+# these once at import, so no per-call allocations remain
+_LANG_MAP = {'A': 'EN', 'B': 'EN_ACCENT', 'C': 'CN', 'D': 'SV'}
+_SPEECH_MAP = {'A': 'REGULAR', 'B': 'QUIET', 'C': 'WHISPER'}
+_BG_MAP = {'A': 'NIGHTCLUB', 'B': 'CAFE', 'C': 'SPEAKING'}
+
+# Intern the result strings so every ValidationResult built from the
+# schema shares the same str objects, whatever the scan size
+for _map in (_LANG_MAP, _SPEECH_MAP, _BG_MAP):
+    for _code in _map:
+        _map[_code] = sys.intern(_map[_code])
+
+# Matched with search() against the name tail; re handles the case
+# folding in C, so no lowercased copy of the name is ever made
+_AUDIO_RE = re.compile(r'\.(?:wav|mp3|m4a|flac)$', re.IGNORECASE)
+
+def _as_table(code_map: Dict[str, str]):
+    """Expand a code map into a 26-slot tuple indexed by ord(c) - ord('A')"""
+    table = [None] * 26
+    for code, value in code_map.items():
+        table[ord(code) - 65] = value
+    return tuple(table)
+
+# Lookup tables indexed by ord(code) - ord('A'); codes outside the
+# schema land on None so the hot path is one bounds check plus an index
+_LANG = _as_table(_LANG_MAP)
+_SPEECH = _as_table(_SPEECH_MAP)
+_BG = _as_table(_BG_MAP)
+
+# Optional Numba path: batches of thousands of stems validate in one
+# native loop; everything still works without numba installed
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    njit = None
+
+_NUMBA_BATCH_MIN = 1024
+
+# Optional AOT-compiled validator, built by build_validator.py; unlike
+# the njit path it needs no JIT warmup and no Numba at runtime
+try:
+    from validator_c import validate as _validate_c
+except ImportError:
+    _validate_c = None
+
+if njit is not None:
+    # Class index per (position, ASCII byte), or -1 for invalid; captured
+    # by the kernel as a compile-time constant
+    _CODE_CLASS = np.full((3, 256), -1, dtype=np.int8)
+    for _pos, _map in enumerate((_LANG_MAP, _SPEECH_MAP, _BG_MAP)):
+        for _idx, _ch in enumerate(_map):
+            _CODE_CLASS[_pos, ord(_ch)] = _idx
+
+    @njit(cache=True)
+    def _validate_batch(codes):
+        """Classify an (N, 3) uint8 stem matrix; -1 marks invalid rows,
+        valid rows encode lang*9 + speech*3 + background"""
+        n = codes.shape[0]
+        out = np.empty(n, dtype=np.int8)
+        for row in range(n):
+            a = _CODE_CLASS[0, codes[row, 0]]
+            b = _CODE_CLASS[1, codes[row, 1]]
+            c = _CODE_CLASS[2, codes[row, 2]]
+            if a < 0 or b < 0 or c < 0:
+                out[row] = -1
+            else:
+                out[row] = a * 9 + b * 3 + c
+        return out
+
+# All 36 valid codes packed as (c0<<16)|(c1<<8)|c2 -> prebuilt
+# ValidationResults, so the hot path is one hash lookup with no
+# per-character branching; anything else falls to the error formatter
+_TABLE = {
+    (ord(a) << 16) | (ord(b) << 8) | ord(c):
+        ValidationResult(True, _LANG_MAP[a], _SPEECH_MAP[b], _BG_MAP[c])
+    for a in _LANG_MAP for b in _SPEECH_MAP for c in _BG_MAP
+}
+
+def _compile_validator():
+    """Generate the per-character validator as straight-line code.
+
+    The if/elif chains are emitted from the schema tables at import
+    time and compiled once with exec(), so the resulting function runs
+    without dict lookups or loops.
+    """
+    fields = (
+        (0, 'language', _LANG_MAP, "Invalid language code '{c}'. Must be A, B, C, or D"),
+        (1, 'speech_type', _SPEECH_MAP, "Invalid speech code '{c}'. Must be A, B, or C"),
+        (2, 'background', _BG_MAP, "Invalid background code '{c}'. Must be A, B, or C"),
+    )
+    src = ["def _v(name):", "    errors = []"]
+    for pos, var, code_map, message in fields:
+        src.append(f"    c = name[{pos}]")
+        branch = "if"
+        for code, value in code_map.items():
+            src.append(f"    {branch} c == {code!r}: {var} = {value!r}")
+            branch = "elif"
+        src.append("    else:")
+        src.append(f"        {var} = None")
+        src.append(f"        errors.append(f{message!r})")
+    src.append("    if errors:")
+    src.append("        return ValidationResult(False, error='; '.join(errors))")
+    src.append("    return ValidationResult(True, language, speech_type, background)")
+    namespace = {'ValidationResult': ValidationResult}
+    exec(compile('\n'.join(src), '<validator>', 'exec'), namespace)
+    return namespace['_v']
+
+_v = _compile_validator()
+
+@functools.lru_cache(maxsize=64)
+def _validate_stem(name: str) -> ValidationResult:
+    """Validate an upper-cased stem, memoized since 3-letter codes repeat.
+
+    Returns an immutable ValidationResult so cache hits can be shared
+    safely between callers.
+    """
+    if len(name) != 3:
+        return ValidationResult(
+            False, error=f"Filename must be exactly 3 characters, got {len(name)}")
+
+    # The packed key below assumes one byte per character; codepoints
+    # above 255 would bleed into the neighbouring byte and could alias a
+    # valid key ('@ŁA' packs to the same key as 'AAA'), so non-ASCII
+    # stems go straight to the error formatter
+    if not name.isascii():
+        return _v(name)
+
+    # Native classifier first when the AOT extension is built; decode
+    # its lang*9 + speech*3 + background result through the tables
+    if _validate_c is not None:
+        code = _validate_c(ord(name[0]), ord(name[1]), ord(name[2]))
+        if code >= 0:
+            return ValidationResult(True, _LANG[code // 9],
+                                    _SPEECH[code % 9 // 3], _BG[code % 3])
+        return _v(name)
+
+    hit = _TABLE.get((ord(name[0]) << 16) | (ord(name[1]) << 8) | ord(name[2]))
+    if hit is not None:
+        return hit
+
+    # Table miss means at least one code is invalid; the generated
+    # per-character validator assembles the error message
+    return _v(name)
+
+def validate_filename(filename: str) -> ValidationResult:
     """Validate a single filename against the naming convention"""
-    name = Path(filename).stem.upper()
-    
+    # Inputs are bare filenames, so strip the extension by slicing
+    # rather than paying for a PurePath construction per call
+    dot = filename.rfind('.')
+    name = filename[:dot] if dot > 0 else filename
+
+    # Reject wrong-length stems before spending an allocation on upper()
     if len(name) != 3:
-        return {
-            'valid': False,
-            'error': f"Filename must be exactly 3 characters, got {len(name)}"
-        }
-    
-    # Check each character
-    language_code = name[0]
-    speech_code = name[1]
-    background_code = name[2]
-    
-    language_map = {'A': 'EN', 'B': 'EN_ACCENT', 'C': 'CN', 'D': 'SV'}
-    speech_map = {'A': 'REGULAR', 'B': 'QUIET', 'C': 'WHISPER'}
-    background_map = {'A': 'NIGHTCLUB', 'B': 'CAFE', 'C': 'SPEAKING'}
-    
-    errors = []
-    
-    if language_code not in language_map:
-        errors.append(f"Invalid language code '{language_code}'. Must be A, B, C, or D")
-    
-    if speech_code not in speech_map:
-        errors.append(f"Invalid speech code '{speech_code}'. Must be A, B, or C")
-    
-    if background_code not in background_map:
-        errors.append(f"Invalid background code '{background_code}'. Must be A, B, or C")
-    
-    if errors:
-        return {
-            'valid': False,
-            'error': '; '.join(errors)
-        }
-    
-    return {
-        'valid': True,
-        'language': language_map[language_code],
-        'speech_type': speech_map[speech_code],
-        'background': background_map[background_code]
-    }
+        return ValidationResult(
+            False, error=f"Filename must be exactly 3 characters, got {len(name)}")
+
+    # The cached result is immutable, so it can be returned directly
+    return _validate_stem(name.upper())
+
+def _iter_audio_names(directory: Path):
+    """Yield audio filenames from one os.scandir pass, no Path objects"""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and _AUDIO_RE.search(entry.name):
+                yield entry.name
+
+# Listing cache: directory -> (mtime_ns, sorted names). Only sound for
+# single-writer directories, hence the use_cache escape hatch below
+_SCAN_CACHE = {}
+_SCAN_CACHE_MAX = 8
+
+def _list_audio_names(directory: Path, use_cache: bool = True) -> List[str]:
+    """Return sorted audio filenames, reusing the cached listing while
+    the directory mtime is unchanged"""
+    key = str(directory)
+    mtime_ns = os.stat(directory).st_mtime_ns
+    if use_cache:
+        cached = _SCAN_CACHE.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+    names = sorted(_iter_audio_names(directory))
+
+    if use_cache:
+        if key not in _SCAN_CACHE and len(_SCAN_CACHE) >= _SCAN_CACHE_MAX:
+            _SCAN_CACHE.pop(next(iter(_SCAN_CACHE)))
+        _SCAN_CACHE[key] = (mtime_ns, names)
+    return names
 
-def check_directory(directory: Path) -> Dict:
+def iter_validations(names):
+    """Yield (filename, validation) pairs for an iterable of filenames.
+
+    Streams one result at a time, so peak memory stays proportional to
+    whatever the caller keeps rather than to the input size.
+    """
+    for name in names:
+        yield name, validate_filename(name)
+
+def _batch_validations(names):
+    """Validate many filenames in one Numba kernel call.
+
+    Yields the same (filename, validation) pairs as iter_validations;
+    names the kernel cannot classify (wrong length, non-ASCII, invalid
+    codes) are re-validated on the scalar path, which also formats the
+    error message.
+    """
+    rows = np.zeros((len(names), 3), dtype=np.uint8)
+    eligible = np.zeros(len(names), dtype=np.bool_)
+    for i, name in enumerate(names):
+        dot = name.rfind('.')
+        stem = (name[:dot] if dot > 0 else name).upper()
+        if len(stem) == 3 and stem.isascii():
+            rows[i, 0] = ord(stem[0])
+            rows[i, 1] = ord(stem[1])
+            rows[i, 2] = ord(stem[2])
+            eligible[i] = True
+
+    codes = _validate_batch(rows)
+    for i, name in enumerate(names):
+        code = codes[i]
+        if eligible[i] and code >= 0:
+            yield name, ValidationResult(True, _LANG[code // 9],
+                                         _SPEECH[code % 9 // 3], _BG[code % 3])
+        else:
+            yield name, validate_filename(name)
+
+def check_directory(directory: Path, use_cache: bool = True) -> Dict:
     """Check all audio files in a directory"""
     if not directory.exists():
         return {
             'exists': False,
             'error': f"Directory {directory} does not exist"
         }
-    
-    audio_extensions = ['.wav', '.mp3', '.m4a', '.flac']
-    audio_files = []
-    
-    for ext in audio_extensions:
-        audio_files.extend(directory.glob(f"*{ext}"))
-    
-    results = {
+
+    # Sorted (and mtime-cached) listing keeps output deterministic;
+    # large directories go through the native batch kernel when available
+    names = _list_audio_names(directory, use_cache)
+    if njit is not None and len(names) >= _NUMBA_BATCH_MIN:
+        validations = _batch_validations(names)
+    else:
+        validations = iter_validations(names)
+
+    # Discovery and validation run fused in one pass; accumulate in
+    # locals and assemble the results dict once at the end
+    total_files = 0
+    valid_files_details = []
+    invalid_files = []
+    for audio_file, validation in validations:
+        total_files += 1
+        if validation.valid:
+            valid_files_details.append((audio_file, validation))
+        else:
+            invalid_files.append((audio_file, validation))
+
+    return {
         'exists': True,
-        'total_files': len(audio_files),
-        'valid_files': 0,
-        'invalid_files': [],
-        'valid_files_details': []
+        'total_files': total_files,
+        'valid_files': len(valid_files_details),
+        'invalid_files': invalid_files,
+        'valid_files_details': valid_files_details
     }
-    
-    for audio_file in audio_files:
-        validation = validate_filename(audio_file.name)
-        if validation['valid']:
-            results['valid_files'] += 1
-            results['valid_files_details'].append({
-                'filename': audio_file.name,
-                'language': validation['language'],
-                'speech_type': validation['speech_type'],
-                'background': validation['background']
-            })
-        else:
-            results['invalid_files'].append({
-                'filename': audio_file.name,
-                'error': validation['error']
-            })
-    
-    return results
 
 def main():
     """Main validation function"""
@@ -97,34 +289,40 @@ def main():
     print()
     
     data_dir = Path("data")
-    
-    for system in ['skywalk', 'nothing']:
-        system_dir = data_dir / system
-        print(f"Checking {system.upper()} directory...")
-        
-        results = check_directory(system_dir)
-        
+    systems = ['skywalk', 'nothing']
+
+    # Scan both directories concurrently (enumeration is I/O-bound and
+    # the scans share no state); printing stays in the original order
+    with ThreadPoolExecutor(max_workers=len(systems)) as executor:
+        scans = list(zip(systems, executor.map(lambda s: check_directory(data_dir / s), systems)))
+
+    for system, results in scans:
+        # Buffer the whole block and write it once, instead of paying a
+        # stdout lock/flush per file line
+        out = [f"Checking {system.upper()} directory...\n"]
+
         if not results['exists']:
-            print(f"  ❌ {results['error']}")
-            print()
+            out.append(f"  ❌ {results['error']}\n\n")
+            sys.stdout.write(''.join(out))
             continue
-        
-        print(f"  📁 Directory: {system_dir}")
-        print(f"  📊 Total files: {results['total_files']}")
-        print(f"  ✅ Valid files: {results['valid_files']}")
-        print(f"  ❌ Invalid files: {len(results['invalid_files'])}")
-        
-        if results['valid_files'] > 0:
-            print("\n  Valid files:")
-            for file_info in results['valid_files_details']:
-                print(f"    ✅ {file_info['filename']} ({file_info['language']} {file_info['speech_type']} {file_info['background']})")
-        
+
+        out.append(f"  📁 Directory: {data_dir / system}\n")
+        out.append(f"  📊 Total files: {results['total_files']}\n")
+        out.append(f"  ✅ Valid files: {results['valid_files']}\n")
+        out.append(f"  ❌ Invalid files: {len(results['invalid_files'])}\n")
+
+        if results['valid_files_details']:
+            out.append("\n  Valid files:\n")
+            for filename, validation in results['valid_files_details']:
+                out.append(f"    ✅ {filename} ({validation.language} {validation.speech_type} {validation.background})\n")
+
         if results['invalid_files']:
-            print("\n  Invalid files:")
-            for file_info in results['invalid_files']:
-                print(f"    ❌ {file_info['filename']}: {file_info['error']}")
-        
-        print()
+            out.append("\n  Invalid files:\n")
+            for filename, validation in results['invalid_files']:
+                out.append(f"    ❌ {filename}: {validation.error}\n")
+
+        out.append("\n")
+        sys.stdout.write(''.join(out))
     
     # Summary
     print("Naming Convention Reference:")